@@ -17,6 +17,14 @@ def create_app():
     jwt.init_app(app)
     CORS(app)
     
+    # Request latency, SQL query counts and the /metrics endpoint
+    if app.config['METRICS_ENABLED']:
+        from backend.utils.metrics import init_metrics
+        from backend.routes.metrics import metrics_bp
+        
+        init_metrics(app)
+        app.register_blueprint(metrics_bp)
+    
     # Register blueprints
     from backend.routes.auth import auth_bp
     from backend.routes.appointment import appointment_bp
@@ -30,4 +38,8 @@ def create_app():
     with app.app_context():
         db.create_all()
     
+    # Start refreshing precomputed wait-time estimates
+    from backend.services.wait_time_estimator import wait_time_estimator
+    wait_time_estimator.init_app(app)
+    
     return app
\ No newline at end of file
@@ -9,4 +9,18 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
-    CORS_HEADERS = 'Content-Type'
\ No newline at end of file
+    CORS_HEADERS = 'Content-Type'
+
+    # Observability
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_QUERY_BUDGET = int(os.environ.get('METRICS_QUERY_BUDGET') or 20)
+    METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # bearer token for scrapers; admins only if unset
+    PROFILER_HEADER = 'X-Profile'  # send '1' to profile the request
+    PROFILER_SAMPLE_INTERVAL = float(os.environ.get('PROFILER_SAMPLE_INTERVAL') or 0.005)  # seconds
+
+    # Wait-time estimation
+    WAIT_TIME_MODEL_PATH = os.environ.get('WAIT_TIME_MODEL_PATH')  # pickled HospitalPredictor
+    WAIT_TIME_REFRESH_SECONDS = int(os.environ.get('WAIT_TIME_REFRESH_SECONDS') or 300)
+    WAIT_TIME_HORIZON_DAYS = int(os.environ.get('WAIT_TIME_HORIZON_DAYS') or 14)  # days ahead of today
+    DEFAULT_CONSULTATION_TIME = 15  # minutes
@@ -1,10 +1,11 @@
 # backend/routes/appointment.py
 from flask import Blueprint, request, jsonify
 from backend.services.queue_manager import QueueManager
+from backend.services.wait_time_estimator import wait_time_estimator
 from backend.models import Appointment, Patient, Doctor
 
 appointment_bp = Blueprint('appointment', __name__)
-queue_manager = QueueManager()
+queue_manager = QueueManager(wait_time_estimator)
 
 @appointment_bp.route('/appointments', methods=['POST'])
 @jwt_required()
@@ -0,0 +1,20 @@
+# backend/routes/metrics.py
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+from backend.utils.metrics import is_admin_request
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        authorized = hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    else:
+        authorized = is_admin_request()
+
+    if not authorized:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    registry = current_app.extensions['metrics']
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
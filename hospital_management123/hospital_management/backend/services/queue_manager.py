@@ -1,27 +1,35 @@
 # backend/services/queue_manager.py
 from datetime import datetime, timedelta
 import numpy as np
+from flask import current_app
 from backend.models import Appointment, Doctor
 
 class QueueManager:
-    def __init__(self):
-        self.average_consultation_time = 15  # minutes
+    def __init__(self, wait_time_estimator=None):
+        self.wait_time_estimator = wait_time_estimator
 
     def calculate_wait_time(self, department_id, doctor_id, appointment_time):
         """Calculate estimated wait time for a patient based on current queue"""
-        # Get all appointments for the same doctor on the same day
-        current_queue = Appointment.query.filter(
+        queue_position = self.get_queue_position(doctor_id, appointment_time)
+
+        # Per-doctor consultation time precomputed from the wait-time model, if available
+        if self.wait_time_estimator:
+            consultation_time = self.wait_time_estimator.get_consultation_time(
+                department_id, doctor_id, appointment_time
+            )
+        else:
+            consultation_time = current_app.config['DEFAULT_CONSULTATION_TIME']
+        
+        return queue_position * consultation_time
+
+    def get_queue_position(self, doctor_id, appointment_time):
+        """Count active appointments for the doctor up to the given time on the same day"""
+        return Appointment.query.filter(
             Appointment.doctor_id == doctor_id,
             Appointment.appointment_time >= appointment_time.replace(hour=0, minute=0),
-            Appointment.appointment_time <= appointment_time.replace(hour=23, minute=59),
+            Appointment.appointment_time <= appointment_time,
             Appointment.status.in_(['scheduled', 'in-progress'])
-        ).order_by(Appointment.appointment_time).all()
-
-        # Calculate estimated wait time based on queue position and average consultation time
-        queue_position = len([apt for apt in current_queue 
-                            if apt.appointment_time <= appointment_time])
-        
-        return queue_position * self.average_consultation_time
+        ).count()
 
     def optimize_queue(self, department_id):
         """Optimize queue based on various factors"""
@@ -0,0 +1,150 @@
+# backend/services/wait_time_estimator.py
+import atexit
+import os
+import pickle
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+import pandas as pd
+from backend.config import Config
+from backend.models import Appointment
+
+class WaitTimeEstimator:
+    def __init__(self):
+        self.default_consultation_time = Config.DEFAULT_CONSULTATION_TIME  # minutes
+        self.refresh_interval = Config.WAIT_TIME_REFRESH_SECONDS
+        self.horizon_days = Config.WAIT_TIME_HORIZON_DAYS
+        self.predictor = None
+        self.last_refreshed = None
+        # (date, department_id, doctor_id, hour) -> minutes per patient ahead of a new
+        # booking in the doctor's queue for that day (QueueManager.get_queue_position).
+        # Each value is the model's predicted wait at that hour's load divided by the
+        # hour's bookings plus the new patient. doctor_id None is the department row.
+        # Rebuilt off the request path and swapped in whole, so readers never need a lock.
+        self._estimates = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        atexit.register(self.stop)
+
+    def init_app(self, app):
+        """Load the trained wait-time model and start the background refresher"""
+        # A previous create_app() may have started a refresher bound to another app
+        self.stop()
+        self.predictor = None
+        self._estimates = {}
+
+        self.default_consultation_time = app.config['DEFAULT_CONSULTATION_TIME']
+        self.refresh_interval = app.config['WAIT_TIME_REFRESH_SECONDS']
+        self.horizon_days = app.config['WAIT_TIME_HORIZON_DAYS']
+
+        model_path = app.config.get('WAIT_TIME_MODEL_PATH')
+        if not model_path or not os.path.exists(model_path):
+            app.logger.warning('No wait-time model at %s, using %d minute consultations',
+                               model_path, self.default_consultation_time)
+            return
+
+        with open(model_path, 'rb') as f:
+            self.predictor = pickle.load(f)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(app,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def get_consultation_time(self, department_id, doctor_id, appointment_time):
+        """Look up the cached minutes-per-patient estimate for a doctor at the appointment's hour"""
+        estimates = self._estimates
+        date, hour = appointment_time.date(), appointment_time.hour
+        # Doctors with nothing booked that hour use the department row; dates outside
+        # the refresh horizon use the default
+        return estimates.get(
+            (date, department_id, doctor_id, hour),
+            estimates.get((date, department_id, None, hour), self.default_consultation_time)
+        )
+
+    def refresh(self):
+        """Recompute all estimates from the wait-time model and the booked load"""
+        if self.predictor is None:
+            return
+
+        now = datetime.now()
+        keys, features = self._build_features(now)
+        if not keys:
+            self._estimates = {}
+            self.last_refreshed = now
+            return
+
+        # One batched model call for every (date, department, doctor, hour) row. The
+        # model predicts a patient's total wait at that load, so spread it over the
+        # patients booked plus the new one to avoid counting the queue twice once it
+        # is multiplied by queue position.
+        predictions = self.predictor.predict_wait_time(pd.DataFrame(features))
+        self._estimates = {
+            key: max(1, int(round(minutes / (load + 1))))
+            for key, minutes, load in zip(keys, predictions, features['current_patients'])
+        }
+        self.last_refreshed = now
+
+    def _build_features(self, now):
+        """Build wait-time model features per doctor and department for each day and hour"""
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        dates = [(day_start + timedelta(days=offset)).date() for offset in range(self.horizon_days + 1)]
+        rows = Appointment.query.with_entities(
+            Appointment.department_id,
+            Appointment.doctor_id,
+            Appointment.appointment_time
+        ).filter(
+            Appointment.appointment_time >= day_start,
+            Appointment.appointment_time < day_start + timedelta(days=len(dates)),
+            Appointment.status.in_(['scheduled', 'in-progress'])
+        ).all()
+
+        # Appointments per (date, department, doctor, hour) and the doctors seen per department
+        booked = defaultdict(int)
+        department_doctors = defaultdict(set)
+        for department_id, doctor_id, appointment_time in rows:
+            booked[(appointment_time.date(), department_id, doctor_id, appointment_time.hour)] += 1
+            department_doctors[department_id].add(doctor_id)
+
+        slots_per_hour = max(1, 60 // self.default_consultation_time)
+        keys = []
+        features = defaultdict(list)
+        for department_id, doctors in department_doctors.items():
+            for date in dates:
+                for hour in range(24):
+                    loads = {d: booked[(date, department_id, d, hour)] for d in doctors}
+                    free_doctors = len([d for d in doctors if loads[d] < slots_per_hour])
+                    # Doctors are only cached for hours they have bookings in; the
+                    # (department, None) row covers everyone else at the average load
+                    rows_for_hour = [(d, load) for d, load in loads.items() if load > 0]
+                    rows_for_hour.append((None, sum(loads.values()) / len(doctors)))
+
+                    for doctor_id, load in rows_for_hour:
+                        keys.append((date, department_id, doctor_id, hour))
+                        features['current_patients'].append(load)
+                        features['max_capacity'].append(slots_per_hour)
+                        features['available_staff'].append(free_doctors)
+                        features['total_staff'].append(len(doctors))
+                        features['hour'].append(hour)
+                        features['is_emergency'].append(False)
+                        features['priority_score'].append(0)
+
+        return keys, features
+
+    def _run(self, app):
+        """Refresh estimates every refresh_interval seconds until stopped"""
+        while not self._stop_event.is_set():
+            with app.app_context():
+                try:
+                    self.refresh()
+                except Exception:
+                    app.logger.exception('Failed to refresh wait-time estimates')
+            self._stop_event.wait(self.refresh_interval)
+
+wait_time_estimator = WaitTimeEstimator()
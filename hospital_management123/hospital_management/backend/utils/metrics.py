@@ -0,0 +1,202 @@
+# backend/utils/metrics.py
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from flask import g, request, has_request_context
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend.utils.profiler import SamplingProfiler
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Record a single observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Yield (upper bound, cumulative count) pairs including +Inf"""
+        running = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            running += count
+            yield bound, running
+
+class MetricsRegistry:
+    def __init__(self, latency_buckets):
+        self.latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self.request_latency = {}  # (endpoint, method) -> Histogram
+        self.request_totals = Counter()  # (endpoint, method, status) -> count
+        self.query_counts = {}  # endpoint -> Histogram of queries per request
+        self.db_queries = Counter()  # endpoint -> total queries
+        self.db_time = defaultdict(float)  # endpoint -> total seconds in DB
+        self.budget_exceeded = Counter()  # endpoint -> requests over budget
+
+    def observe_request(self, endpoint, method, status, duration, query_count, db_time, over_budget):
+        """Record latency and database usage for a finished request"""
+        with self._lock:
+            latency = self.request_latency.get((endpoint, method))
+            if latency is None:
+                latency = self.request_latency[(endpoint, method)] = Histogram(self.latency_buckets)
+            latency.observe(duration)
+            self.request_totals[(endpoint, method, str(status))] += 1
+
+            queries = self.query_counts.get(endpoint)
+            if queries is None:
+                queries = self.query_counts[endpoint] = Histogram(QUERY_COUNT_BUCKETS)
+            queries.observe(query_count)
+            self.db_queries[endpoint] += query_count
+            self.db_time[endpoint] += db_time
+            if over_budget:
+                self.budget_exceeded[endpoint] += 1
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, 'http_request_duration_seconds',
+                                    'Request latency in seconds by endpoint',
+                                    self.request_latency, ('endpoint', 'method'))
+            self._render_counter(lines, 'http_requests_total',
+                                 'Total requests by endpoint, method and status',
+                                 self.request_totals, ('endpoint', 'method', 'status'))
+            self._render_histograms(lines, 'db_queries_per_request',
+                                    'SQL queries issued per request by endpoint',
+                                    {(k,): v for k, v in self.query_counts.items()}, ('endpoint',))
+            self._render_counter(lines, 'db_queries_total',
+                                 'Total SQL queries issued by endpoint',
+                                 {(k,): v for k, v in self.db_queries.items()}, ('endpoint',))
+            self._render_counter(lines, 'db_query_duration_seconds_total',
+                                 'Total time spent executing SQL by endpoint',
+                                 {(k,): v for k, v in self.db_time.items()}, ('endpoint',))
+            self._render_counter(lines, 'db_query_budget_exceeded_total',
+                                 'Requests that exceeded the configured query budget',
+                                 {(k,): v for k, v in self.budget_exceeded.items()}, ('endpoint',))
+        return '\n'.join(lines) + '\n'
+
+    def _render_histograms(self, lines, name, help_text, histograms, label_names):
+        """Append HELP/TYPE headers and bucket, sum and count samples"""
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key, histogram in sorted(histograms.items()):
+            labels = dict(zip(label_names, key))
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{_format_labels(labels, le=bound)} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+    def _render_counter(self, lines, name, help_text, values, label_names):
+        """Append HELP/TYPE headers and one sample per label set"""
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for key, value in sorted(values.items()):
+            lines.append(f'{name}{_format_labels(dict(zip(label_names, key)))} {value}')
+
+def _format_labels(labels, **extra):
+    """Format a label dict as {a="x",b="y"} with Prometheus escaping"""
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Remember when the statement started on this connection"""
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Count the statement and its duration against the current request"""
+    start = conn.info['query_start_time'].pop()
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+        g.db_time += time.perf_counter() - start
+
+def is_admin_request():
+    """Check whether the current request carries a JWT for an admin user"""
+    from backend.models import User
+
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+
+    identity = get_jwt_identity()
+    if identity is None:
+        return False
+    user = User.query.get(identity)
+    return user is not None and user.role == 'admin'
+
+def init_metrics(app):
+    """Register request timing, SQL query counting and the admin profiler hook"""
+    registry = MetricsRegistry(app.config['METRICS_LATENCY_BUCKETS'])
+    app.extensions['metrics'] = registry
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_start_time = time.perf_counter()
+        # Check for admins before the counters exist so the user lookup isn't counted
+        profile = request.headers.get(app.config['PROFILER_HEADER']) == '1' and is_admin_request()
+
+        g.query_count = 0
+        g.db_time = 0.0
+        g.profiler = None
+
+        if profile:
+            g.profiler = SamplingProfiler(interval=app.config['PROFILER_SAMPLE_INTERVAL'])
+            g.profiler.start()
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'request_start_time' not in g:
+            return response
+
+        duration = time.perf_counter() - g.request_start_time
+        endpoint = request.endpoint or 'unmatched'
+        budget = app.config['METRICS_QUERY_BUDGET']
+        over_budget = g.query_count > budget
+
+        if over_budget:
+            app.logger.warning(
+                'Query budget exceeded on %s %s: %d queries (budget %d), %.1fms in DB, %.1fms total',
+                request.method, request.path, g.query_count, budget,
+                g.db_time * 1000, duration * 1000
+            )
+
+        registry.observe_request(endpoint, request.method, response.status_code,
+                                 duration, g.query_count, g.db_time, over_budget)
+
+        if g.profiler:
+            g.profiler.stop()
+            # WARNING like the query budget message, since nothing lowers the logger level
+            app.logger.warning('Profile for %s %s:\n%s', request.method, request.path,
+                               '\n'.join(g.profiler.report()))
+            response.headers['X-Profile-Samples'] = str(g.profiler.sample_count)
+            g.profiler = None
+
+        return response
+
+    @app.teardown_request
+    def stop_request_profiler(exc):
+        # Safety net in case an after_request function raised before the sampler was stopped
+        profiler = g.pop('profiler', None)
+        if profiler:
+            profiler.stop()
+
+    return registry
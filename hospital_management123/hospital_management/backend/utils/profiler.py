@@ -0,0 +1,55 @@
+# backend/utils/profiler.py
+import sys
+import threading
+import time
+from collections import Counter
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, max_depth=30):
+        self.interval = interval  # seconds between samples
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self.sample_count = 0
+        self._target_thread_id = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id=None):
+        """Start sampling the stack of the given thread (defaults to the caller)"""
+        self._target_thread_id = thread_id or threading.get_ident()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread to exit"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def report(self, limit=15):
+        """Return the most frequently sampled stacks as text lines"""
+        lines = [f"{self.sample_count} samples at {self.interval * 1000:.1f}ms interval"]
+        for stack, count in self.samples.most_common(limit):
+            share = count / self.sample_count * 100 if self.sample_count else 0
+            lines.append(f"{count:6d} {share:5.1f}%  {stack}")
+        return lines
+
+    def _run(self):
+        """Periodically capture the target thread's current stack"""
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None:
+                continue
+            self.samples[self._format_stack(frame)] += 1
+            self.sample_count += 1
+
+    def _format_stack(self, frame):
+        """Collapse a frame chain into a single 'outer;...;inner' string"""
+        entries = []
+        while frame is not None and len(entries) < self.max_depth:
+            code = frame.f_code
+            entries.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(entries))